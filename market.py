@@ -1,17 +1,33 @@
+import asyncio
 import datetime
 import logging.config
+from functools import lru_cache
 from environs import Env
 from seller import download_stock
 
 import requests
 
-from seller import divide, price_conversion
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json import dumps as json_dumps, loads as json_loads
+
+from seller import (
+    convert_prices,
+    convert_stocks,
+    create_session,
+    divide,
+    join_remnants,
+    upload_chunks,
+)
 
 logger = logging.getLogger(__file__)
 
+_SESSION = create_session()
+
 
 def get_product_list(page, campaign_id, access_token):
-     """Получает список товаров на платформе Яндекс.Маркет.
+    """Получает список товаров на платформе Яндекс.Маркет.
 
     Эта функция отправляет запрос на API Яндекс.Маркет для получения списка товаров
     с использованием пагинации. С помощью параметра `page` загружается следующая страница
@@ -45,9 +61,9 @@ def get_product_list(page, campaign_id, access_token):
         "limit": 200,
     }
     url = endpoint_url + f"campaigns/{campaign_id}/offer-mapping-entries"
-    response = requests.get(url, headers=headers, params=payload)
+    response = _SESSION.get(url, headers=headers, params=payload)
     response.raise_for_status()
-    response_object = response.json()
+    response_object = json_loads(response.content)
     return response_object.get("result")
 
 
@@ -82,9 +98,9 @@ def update_stocks(stocks, campaign_id, access_token):
     }
     payload = {"skus": stocks}
     url = endpoint_url + f"campaigns/{campaign_id}/offers/stocks"
-    response = requests.put(url, headers=headers, json=payload)
+    response = _SESSION.put(url, headers=headers, data=json_dumps(payload))
     response.raise_for_status()
-    response_object = response.json()
+    response_object = json_loads(response.content)
     return response_object
 
 
@@ -118,45 +134,84 @@ def update_price(prices, campaign_id, access_token):
     }
     payload = {"offers": prices}
     url = endpoint_url + f"campaigns/{campaign_id}/offer-prices/updates"
-    response = requests.post(url, headers=headers, json=payload)
+    response = _SESSION.post(url, headers=headers, data=json_dumps(payload))
     response.raise_for_status()
-    response_object = response.json()
+    response_object = json_loads(response.content)
     return response_object
 
 
+@lru_cache(maxsize=8)
 def get_offer_ids(campaign_id, market_token):
     """Получает артикулы товаров Яндекс.Маркет.
 
     Эта функция извлекает артикулы товаров, используя пагинацию для получения всех товаров
-    и их артикулов в указанной кампании на Яндекс.Маркет.
+    и их артикулов в указанной кампании на Яндекс.Маркет. Результат кэшируется для пары
+    (campaign_id, market_token), поэтому повторный вызов не повторяет пагинацию.
 
     Аргументы:
         campaign_id (str): Идентификатор кампании на Яндекс.Маркет.
         market_token (str): Токен доступа к API Яндекс.Маркет.
 
     Возвращает:
-        list: Список артикулов товаров в кампании.
+        tuple: Артикулы товаров в кампании.
 
     Пример:
         >>> get_offer_ids("campaign_id_example", "market_token_example")
-        ["123", "124", "125"]
+        ("123", "124", "125")
 
     Пример некорректного исполнения:
         >>> get_offer_ids("", "")
         Ошибка: Недействительный токен доступа или кампания.
     """
     page = ""
-    product_list = []
+    offer_ids = []
     while True:
+        # Токен следующей страницы приходит только в ответе на текущую,
+        # поэтому артикулы извлекаются сразу, без хранения всех карточек.
         some_prod = get_product_list(page, campaign_id, market_token)
-        product_list.extend(some_prod.get("offerMappingEntries"))
+        products = some_prod["offerMappingEntries"]
+        offer_ids += [product["offer"]["shopSku"] for product in products]
         page = some_prod.get("paging").get("nextPageToken")
         if not page:
             break
-    offer_ids = []
-    for product in product_list:
-        offer_ids.append(product.get("offer").get("shopSku"))
-    return offer_ids
+    return tuple(offer_ids)
+
+
+def iter_stocks(loaded, offer_ids, warehouse_id):
+    """Генерирует остатки товаров для обновления на Яндекс.Маркет.
+
+    Эта функция выдает остатки по одному, чтобы их можно было отправлять по частям
+    через `divide`, не собирая весь список в памяти. Остатки выдаются в порядке
+    `offer_ids`, как и у `create_stocks`.
+
+    Аргументы:
+        loaded (pd.DataFrame): Остатки загруженных товаров из `join_remnants`.
+        offer_ids (list): Список артикулов товаров, загруженных в Яндекс.Маркет.
+        warehouse_id (str): Идентификатор склада для товара.
+
+    Возвращает:
+        generator: Генератор словарей с артикулом и остатком товара.
+
+    Пример:
+        >>> next(iter_stocks(join_remnants([{"Код": "123", "Количество": "10"}], ["123"]), ["123"], "warehouse_1"))
+        {'sku': '123', 'warehouseId': 'warehouse_1', 'items': [{'count': 10, 'type': 'FIT', 'updatedAt': '2022-12-31T12:00:00Z'}]}
+    """
+    date = str(datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z")
+    loaded = loaded.drop_duplicates("code").set_index("code")
+    # Недостающее из загруженного получит нулевой остаток:
+    counts = convert_stocks(loaded["Количество"]).reindex(offer_ids, fill_value=0)
+    for sku, count in zip(offer_ids, counts.tolist()):
+        yield {
+            "sku": sku,
+            "warehouseId": warehouse_id,
+            "items": [
+                {
+                    "count": count,
+                    "type": "FIT",
+                    "updatedAt": date,
+                }
+            ],
+        }
 
 
 def create_stocks(watch_remnants, offer_ids, warehouse_id):
@@ -164,9 +219,10 @@ def create_stocks(watch_remnants, offer_ids, warehouse_id):
 
     Эта функция создает список остатков товаров, исключая те, которые не были загружены в систему.
     Она добавляет товары с нулевыми остатками, если они присутствуют в данных о товарах.
+    Порядок остатков совпадает с `offer_ids`.
 
     Аргументы:
-        watch_remnants (list): Список остатков товаров, содержащий информацию о кодах товаров и их количестве.
+        watch_remnants (pd.DataFrame | list): Таблица или список остатков товаров, содержащий информацию о кодах товаров и их количестве.
         offer_ids (list): Список артикулов товаров, загруженных в Яндекс.Маркет.
         warehouse_id (str): Идентификатор склада для товара.
 
@@ -179,50 +235,44 @@ def create_stocks(watch_remnants, offer_ids, warehouse_id):
 
     Пример некорректного исполнения:
         >>> create_stocks([{"Код": "123", "Количество": "10"}], [], "warehouse_1")
-        [{'sku': '123', 'warehouseId': 'warehouse_1', 'items': [{'count': 10, 'type': 'FIT', 'updatedAt': '2022-12-31T12:00:00Z'}]}]
+        []
     """
     # Уберем то, что не загружено в market
-    stocks = list()
-    date = str(datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z")
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            count = str(watch.get("Количество"))
-            if count == ">10":
-                stock = 100
-            elif count == "1":
-                stock = 0
-            else:
-                stock = int(watch.get("Количество"))
-            stocks.append(
-                {
-                    "sku": str(watch.get("Код")),
-                    "warehouseId": warehouse_id,
-                    "items": [
-                        {
-                            "count": stock,
-                            "type": "FIT",
-                            "updatedAt": date,
-                        }
-                    ],
-                }
-            )
-            offer_ids.remove(str(watch.get("Код")))
-    # Добавим недостающее из загруженного:
-    for offer_id in offer_ids:
-        stocks.append(
-            {
-                "sku": offer_id,
-                "warehouseId": warehouse_id,
-                "items": [
-                    {
-                        "count": 0,
-                        "type": "FIT",
-                        "updatedAt": date,
-                    }
-                ],
-            }
-        )
-    return stocks
+    loaded = join_remnants(watch_remnants, offer_ids)
+    return list(iter_stocks(loaded, offer_ids, warehouse_id))
+
+
+def iter_prices(loaded):
+    """Генерирует цены товаров для обновления на Яндекс.Маркет.
+
+    Эта функция выдает цены по одной, чтобы их можно было отправлять по частям
+    через `divide`, не собирая весь список в памяти. Порядок и состав такие же,
+    как у `create_prices`.
+
+    Аргументы:
+        loaded (pd.DataFrame): Остатки загруженных товаров из `join_remnants`.
+
+    Возвращает:
+        generator: Генератор словарей с артикулом и ценой товара.
+
+    Пример:
+        >>> next(iter_prices(join_remnants([{"Код": "123", "Цена": "5'990.00 руб."}], ["123"])))
+        {'id': '123', 'price': {'value': 5990, 'currencyId': 'RUR'}}
+    """
+    values = convert_prices(loaded["Цена"]).astype(int).tolist()
+    for code, value in zip(loaded["code"].tolist(), values):
+        yield {
+            "id": code,
+            # "feed": {"id": 0},
+            "price": {
+                "value": value,
+                # "discountBase": 0,
+                "currencyId": "RUR",
+                # "vat": 0,
+            },
+            # "marketSku": 0,
+            # "shopSku": "string",
+        }
 
 
 def create_prices(watch_remnants, offer_ids):
@@ -232,7 +282,7 @@ def create_prices(watch_remnants, offer_ids):
     и формирует формат для отправки на Яндекс.Маркет.
 
     Аргументы:
-        watch_remnants (list): Список остатков товаров, содержащий информацию о кодах товаров и их ценах.
+        watch_remnants (pd.DataFrame | list): Таблица или список остатков товаров, содержащий информацию о кодах товаров и их ценах.
         offer_ids (list): Список артикулов товаров, загруженных в Яндекс.Маркет.
 
     Возвращает:
@@ -246,23 +296,32 @@ def create_prices(watch_remnants, offer_ids):
         >>> create_prices([{"Код": "123", "Цена": "5'990.00 руб."}], [])
         []
     """
-    prices = []
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            price = {
-                "id": str(watch.get("Код")),
-                # "feed": {"id": 0},
-                "price": {
-                    "value": int(price_conversion(watch.get("Цена"))),
-                    # "discountBase": 0,
-                    "currencyId": "RUR",
-                    # "vat": 0,
-                },
-                # "marketSku": 0,
-                # "shopSku": "string",
-            }
-            prices.append(price)
-    return prices
+    loaded = join_remnants(watch_remnants, offer_ids)
+    return list(iter_prices(loaded))
+
+
+def build_payloads(watch_remnants, offer_ids, warehouse_id):
+    """Создает остатки и цены товаров для Яндекс.Маркет за один проход по остаткам.
+
+    Остатки сверяются с артикулами один раз через `join_remnants`, а остатки и цены
+    формируются из общего результата.
+
+    Аргументы:
+        watch_remnants (pd.DataFrame | list): Таблица или список остатков товаров.
+        offer_ids (list): Список артикулов товаров, загруженных в Яндекс.Маркет.
+        warehouse_id (str): Идентификатор склада для товара.
+
+    Возвращает:
+        tuple: Генераторы остатков и цен, как у `iter_stocks` и `iter_prices`.
+
+    Пример:
+        >>> stocks, prices = build_payloads([{"Код": "123", "Количество": "10", "Цена": "5'990.00 руб."}], ["123"], "warehouse_1")
+        >>> list(prices)
+        [{'id': '123', 'price': {'value': 5990, 'currencyId': 'RUR'}}]
+    """
+    # Уберем то, что не загружено в market
+    loaded = join_remnants(watch_remnants, offer_ids)
+    return iter_stocks(loaded, offer_ids, warehouse_id), iter_prices(loaded)
 
 
 async def upload_prices(watch_remnants, campaign_id, market_token):
@@ -273,7 +332,7 @@ async def upload_prices(watch_remnants, campaign_id, market_token):
     товаров в одном запросе.
 
     Аргументы:
-        watch_remnants (list): Список остатков товаров, содержащий информацию о ценах.
+        watch_remnants (pd.DataFrame): Таблица остатков товаров, содержащая информацию о ценах.
         campaign_id (str): Идентификатор кампании на Яндекс.Маркет.
         market_token (str): Токен доступа для аутентификации API.
 
@@ -288,10 +347,9 @@ async def upload_prices(watch_remnants, campaign_id, market_token):
         >>> await upload_prices([], "", "")
         Ошибка: Недействительный токен доступа или кампания.
     """
-    offer_ids = get_offer_ids(campaign_id, market_token)
+    offer_ids = await asyncio.to_thread(get_offer_ids, campaign_id, market_token)
     prices = create_prices(watch_remnants, offer_ids)
-    for some_prices in list(divide(prices, 500)):
-        update_price(some_prices, campaign_id, market_token)
+    await upload_chunks(update_price, divide(prices, 500), campaign_id, market_token)
     return prices
 
 
@@ -303,7 +361,7 @@ async def upload_stocks(watch_remnants, campaign_id, market_token, warehouse_id)
     из финального списка, отправляемого на платформу.
 
     Аргументы:
-        watch_remnants (list): Список остатков товаров, содержащий информацию о количестве.
+        watch_remnants (pd.DataFrame): Таблица остатков товаров, содержащая информацию о количестве.
         campaign_id (str): Идентификатор кампании на Яндекс.Маркет.
         market_token (str): Токен доступа для аутентификации API.
         warehouse_id (str): Идентификатор склада, на котором хранятся товары.
@@ -321,16 +379,69 @@ async def upload_stocks(watch_remnants, campaign_id, market_token, warehouse_id)
         >>> await upload_stocks([], "", "", "")
         Ошибка: Недействительный токен доступа, кампания или склад.
     """
-    offer_ids = get_offer_ids(campaign_id, market_token)
+    offer_ids = await asyncio.to_thread(get_offer_ids, campaign_id, market_token)
     stocks = create_stocks(watch_remnants, offer_ids, warehouse_id)
-    for some_stock in list(divide(stocks, 2000)):
-        update_stocks(some_stock, campaign_id, market_token)
+    await upload_chunks(update_stocks, divide(stocks, 2000), campaign_id, market_token)
     not_empty = list(
         filter(lambda stock: (stock.get("items")[0].get("count") != 0), stocks)
     )
     return not_empty, stocks
 
 
+async def upload_campaign(watch_remnants, campaign_id, market_token, warehouse_id):
+    """Загружает остатки и цены товаров в одну кампанию Яндекс.Маркет.
+
+    Эта асинхронная функция один раз получает артикулы товаров кампании и отправляет
+    остатки и цены на платформу одновременно. Данные формируются по мере отправки
+    частей, поэтому полные списки в памяти не собираются.
+
+    Аргументы:
+        watch_remnants (pd.DataFrame): Таблица остатков товаров с количеством и ценами.
+        campaign_id (str): Идентификатор кампании на Яндекс.Маркет.
+        market_token (str): Токен доступа для аутентификации API.
+        warehouse_id (str): Идентификатор склада, на котором хранятся товары.
+
+    Пример:
+        >>> await upload_campaign(watch_remnants, "campaign_id_example", "market_token_example", "warehouse_1")
+
+    Пример некорректного исполнения:
+        >>> await upload_campaign(watch_remnants, "", "", "")
+        Ошибка: Недействительный токен доступа, кампания или склад.
+    """
+    offer_ids = await asyncio.to_thread(get_offer_ids, campaign_id, market_token)
+    stocks, prices = build_payloads(watch_remnants, offer_ids, warehouse_id)
+    await asyncio.gather(
+        upload_chunks(update_stocks, divide(stocks, 2000), campaign_id, market_token),
+        upload_chunks(update_price, divide(prices, 500), campaign_id, market_token),
+    )
+
+
+async def upload_campaigns(watch_remnants, market_token, campaigns):
+    """Загружает остатки и цены товаров во все кампании Яндекс.Маркет.
+
+    Эта асинхронная функция обновляет все кампании одновременно: кампании не
+    зависят друг от друга.
+
+    Аргументы:
+        watch_remnants (pd.DataFrame): Таблица остатков товаров с количеством и ценами.
+        market_token (str): Токен доступа для аутентификации API.
+        campaigns (list): Список пар (идентификатор кампании, идентификатор склада).
+
+    Пример:
+        >>> await upload_campaigns(watch_remnants, "market_token_example", [("fbs_id", "warehouse_fbs"), ("dbs_id", "warehouse_dbs")])
+
+    Пример некорректного исполнения:
+        >>> await upload_campaigns(watch_remnants, "", [("", "")])
+        Ошибка: Недействительный токен доступа, кампания или склад.
+    """
+    await asyncio.gather(
+        *(
+            upload_campaign(watch_remnants, campaign_id, market_token, warehouse_id)
+            for campaign_id, warehouse_id in campaigns
+        )
+    )
+
+
 def main():
     """Основная функция для обновления остатков и цен на Яндекс.Маркет.
 
@@ -353,29 +464,20 @@ def main():
 
     watch_remnants = download_stock()
     try:
-        # FBS
-        offer_ids = get_offer_ids(campaign_fbs_id, market_token)
-        # Обновить остатки FBS
-        stocks = create_stocks(watch_remnants, offer_ids, warehouse_fbs_id)
-        for some_stock in list(divide(stocks, 2000)):
-            update_stocks(some_stock, campaign_fbs_id, market_token)
-        # Поменять цены FBS
-        upload_prices(watch_remnants, campaign_fbs_id, market_token)
-
-        # DBS
-        offer_ids = get_offer_ids(campaign_dbs_id, market_token)
-        # Обновить остатки DBS
-        stocks = create_stocks(watch_remnants, offer_ids, warehouse_dbs_id)
-        for some_stock in list(divide(stocks, 2000)):
-            update_stocks(some_stock, campaign_dbs_id, market_token)
-        # Поменять цены DBS
-        upload_prices(watch_remnants, campaign_dbs_id, market_token)
+        # Обновить остатки и цены FBS и DBS
+        campaigns = [
+            (campaign_fbs_id, warehouse_fbs_id),
+            (campaign_dbs_id, warehouse_dbs_id),
+        ]
+        asyncio.run(upload_campaigns(watch_remnants, market_token, campaigns))
     except requests.exceptions.ReadTimeout:
         print("Превышено время ожидания...")
     except requests.exceptions.ConnectionError as error:
         print(error, "Ошибка соединения")
     except Exception as error:
         print(error, "ERROR_2")
+    finally:
+        get_offer_ids.cache_clear()
 
 
 if __name__ == "__main__":
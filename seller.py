@@ -1,15 +1,74 @@
-import io
+import asyncio
+import importlib.util
 import logging.config
 import os
 import re
+import tempfile
 import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
 from environs import Env
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json import dumps as json_dumps, loads as json_loads
 
 logger = logging.getLogger(__file__)
 
+# Дробная часть цены или любой нецифровой символ: после удаления остается
+# только целая часть, например, "5'990.00 руб." -> "5990".
+_PRICE_NOISE = re.compile(r"\.[\s\S]*|[^0-9]")
+# Rust-движок calamine читает xls в разы быстрее xlrd; без него pandas выберет
+# движок сам.
+_EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+# Строки Arrow хранятся в одном буфере, и строковые методы pandas обрабатывают
+# их без Python-объектов; без pyarrow используются обычные строки.
+_STRING_DTYPE = "string[pyarrow]" if importlib.util.find_spec("pyarrow") else str
+
+
+def create_session():
+    """Создает HTTP-сессию с пулом соединений и повторными попытками.
+
+    Сессия переиспользует TCP/TLS-соединения между запросами к одному хосту,
+    поэтому пагинация и загрузка по частям не тратят время на новые рукопожатия.
+    Обрывы соединения и временные ошибки сервера (429, 5xx) повторяются с
+    экспоненциальной задержкой и с учетом заголовка Retry-After.
+
+    Возвращает:
+        requests.Session: Настроенная сессия для запросов к API.
+
+    Пример:
+        >>> session = create_session()
+        >>> session.get("https://api-seller.ozon.ru")
+        <Response [200]>
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=5,
+        connect=3,
+        read=3,
+        status=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        # Обновление цен и остатков идемпотентно, поэтому POST и PUT тоже
+        # можно повторять.
+        allowed_methods=frozenset(["GET", "POST", "PUT"]),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = create_session()
+
 
 def get_product_list(last_id, client_id, seller_token):
     """Получает список товаров с платформы Ozon.
@@ -46,6 +105,7 @@ def get_product_list(last_id, client_id, seller_token):
     headers = {
         "Client-Id": client_id,
         "Api-Key": seller_token,
+        "Content-Type": "application/json",
     }
     payload = {
         "filter": {
@@ -54,46 +114,48 @@ def get_product_list(last_id, client_id, seller_token):
         "last_id": last_id,
         "limit": 1000,
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = _SESSION.post(url, data=json_dumps(payload), headers=headers)
     response.raise_for_status()
-    response_object = response.json()
+    response_object = json_loads(response.content)
     return response_object.get("result")
 
 
+@lru_cache(maxsize=8)
 def get_offer_ids(client_id, seller_token):
     """Получает артикулы товаров с платформы Ozon.
 
     Эта функция использует пагинацию для получения всех товаров магазина Ozon, а затем
-    извлекает их артикулы.
+    извлекает их артикулы. Результат кэшируется для пары (client_id, seller_token),
+    поэтому повторный вызов в рамках одного запуска не повторяет пагинацию.
 
     Аргументы:
         client_id (str): Уникальный идентификатор клиента Ozon.
         seller_token (str): Токен API для аутентификации.
 
     Возвращает:
-        list: Список артикулов товаров, которые принадлежат текущему клиенту.
+        tuple: Артикулы товаров, которые принадлежат текущему клиенту.
 
     Пример:
         >>> get_offer_ids("client_id_example", "seller_token_example")
-        ["123", "124", "125"]
+        ("123", "124", "125")
 
     Пример некорректного исполнения:
         >>> get_offer_ids("", "")
         Ошибка: Недействительный токен API или клиентский идентификатор.
     """
     last_id = ""
-    product_list = []
+    offer_ids = []
     while True:
+        # Страницы связаны курсором last_id, поэтому запрашиваются по очереди,
+        # а артикулы извлекаются сразу, без хранения всех карточек товаров.
         some_prod = get_product_list(last_id, client_id, seller_token)
-        product_list.extend(some_prod.get("items"))
+        products = some_prod["items"]
+        offer_ids += [product["offer_id"] for product in products]
         total = some_prod.get("total")
         last_id = some_prod.get("last_id")
-        if total == len(product_list):
+        if not products or total == len(offer_ids):
             break
-    offer_ids = []
-    for product in product_list:
-        offer_ids.append(product.get("offer_id"))
-    return offer_ids
+    return tuple(offer_ids)
 
 
 def update_price(prices: list, client_id, seller_token):
@@ -122,11 +184,12 @@ def update_price(prices: list, client_id, seller_token):
     headers = {
         "Client-Id": client_id,
         "Api-Key": seller_token,
+        "Content-Type": "application/json",
     }
     payload = {"prices": prices}
-    response = requests.post(url, json=payload, headers=headers)
+    response = _SESSION.post(url, data=json_dumps(payload), headers=headers)
     response.raise_for_status()
-    return response.json()
+    return json_loads(response.content)
 
 
 def update_stocks(stocks: list, client_id, seller_token):
@@ -155,58 +218,119 @@ def update_stocks(stocks: list, client_id, seller_token):
     headers = {
         "Client-Id": client_id,
         "Api-Key": seller_token,
+        "Content-Type": "application/json",
     }
     payload = {"stocks": stocks}
-    response = requests.post(url, json=payload, headers=headers)
+    response = _SESSION.post(url, data=json_dumps(payload), headers=headers)
     response.raise_for_status()
-    return response.json()
+    return json_loads(response.content)
 
 
 def download_stock():
     """Скачивает файл остатков товаров с сайта Casio.
 
-    Функция скачивает архив с остатками товаров с сайта Casio, распаковывает его и
-    конвертирует данные в список словарей для дальнейшей обработки.
+    Функция скачивает архив с остатками товаров с сайта Casio во временную папку,
+    распаковывает его и читает таблицу остатков в DataFrame для дальнейшей обработки.
 
     Возвращает:
-        list: Список остатков товаров в формате словарей.
+        pd.DataFrame: Таблица остатков товаров с колонками "Код", "Количество", "Цена".
 
     Пример:
         >>> download_stock()
-        [{'Код': '123', 'Количество': '10'}, {'Код': '124', 'Количество': '>10'}]
+              Код Количество         Цена
+        0     123         10  5'990.00 руб.
+        1     124        >10  1'500.00 руб.
 
     Пример некорректного исполнения:
         Ошибка: Недоступен файл или архив.
     """
     # Скачать остатки с сайта
     casio_url = "https://timeworld.ru/upload/files/ostatki.zip"
-    session = requests.Session()
-    response = session.get(casio_url)
-    response.raise_for_status()
-    with response, zipfile.ZipFile(io.BytesIO(response.content)) as archive:
-        archive.extractall(".")
-    # Создаем список остатков часов:
-    excel_file = "ostatki.xls"
-    watch_remnants = pd.read_excel(
-        io=excel_file,
-        na_values=None,
-        keep_default_na=False,
-        header=17,
-    ).to_dict(orient="records")
-    os.remove("./ostatki.xls")  # Удалить файл
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive_file = os.path.join(tmp_dir, "ostatki.zip")
+        response = _SESSION.get(casio_url, stream=True)
+        response.raise_for_status()
+        with response, open(archive_file, "wb") as file:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                file.write(chunk)
+        with zipfile.ZipFile(archive_file) as archive:
+            archive.extractall(tmp_dir)
+        # Создаем список остатков часов:
+        excel_file = os.path.join(tmp_dir, "ostatki.xls")
+        watch_remnants = pd.read_excel(
+            io=excel_file,
+            na_values=None,
+            keep_default_na=False,
+            header=17,
+            engine=_EXCEL_ENGINE,
+            usecols=["Код", "Количество", "Цена"],
+            dtype={
+                "Код": _STRING_DTYPE,
+                "Количество": _STRING_DTYPE,
+                "Цена": _STRING_DTYPE,
+            },
+        )
     return watch_remnants
 
 
+def join_remnants(watch_remnants, offer_ids):
+    """Отбирает остатки товаров, которые загружены на платформу.
+
+    Коды товаров приводятся к строкам и сверяются с артикулами один раз, после
+    чего результат используется и для остатков, и для цен.
+
+    Аргументы:
+        watch_remnants (pd.DataFrame | list): Таблица или список остатков товаров.
+        offer_ids (list): Список артикулов товаров, загруженных на платформу.
+
+    Возвращает:
+        pd.DataFrame: Остатки загруженных товаров с кодом в колонке "code".
+
+    Пример:
+        >>> join_remnants([{"Код": 123, "Количество": "10", "Цена": "5'990.00 руб."}], ["123"])
+           Код Количество           Цена code
+        0  123         10  5'990.00 руб.  123
+    """
+    remnants = pd.DataFrame(watch_remnants, columns=["Код", "Количество", "Цена"])
+    codes = remnants["Код"].astype(_STRING_DTYPE)
+    return remnants.assign(code=codes)[codes.isin(offer_ids)]
+
+
+def iter_stocks(loaded, offer_ids):
+    """Генерирует остатки товаров для обновления на платформе Ozon.
+
+    Эта функция выдает остатки по одному, чтобы их можно было отправлять по частям
+    через `divide`, не собирая весь список в памяти. Остатки выдаются в порядке
+    `offer_ids`, как и у `create_stocks`.
+
+    Аргументы:
+        loaded (pd.DataFrame): Остатки загруженных товаров из `join_remnants`.
+        offer_ids (list): Список артикулов товаров, загруженных в Ozon.
+
+    Возвращает:
+        generator: Генератор словарей с артикулом и остатком товара.
+
+    Пример:
+        >>> next(iter_stocks(join_remnants([{"Код": "123", "Количество": "10"}], ["123"]), ["123"]))
+        {'offer_id': '123', 'stock': 10}
+    """
+    loaded = loaded.drop_duplicates("code").set_index("code")
+    # Недостающее из загруженного получит нулевой остаток:
+    stocks = convert_stocks(loaded["Количество"]).reindex(offer_ids, fill_value=0)
+    for offer_id, stock in zip(offer_ids, stocks.tolist()):
+        yield {"offer_id": offer_id, "stock": stock}
+
+
 def create_stocks(watch_remnants, offer_ids):
     """Создает список остатков товаров для обновления на платформе Ozon.
 
     Эта функция создает список остатков товаров, исключая те, которые не были
     загружены в систему. Она также добавляет товары с нулевыми остатками, если
-    они присутствуют в данных о товарах.
+    они присутствуют в данных о товарах. Порядок остатков совпадает с `offer_ids`.
 
     Аргументы:
-        watch_remnants (list): Список остатков товаров, содержащий информацию
-                                о кодах товаров и их количестве.
+        watch_remnants (pd.DataFrame | list): Таблица или список остатков товаров,
+                                содержащий информацию о кодах товаров и их количестве.
         offer_ids (list): Список артикулов товаров, загруженных в Ozon.
 
     Возвращает:
@@ -218,25 +342,39 @@ def create_stocks(watch_remnants, offer_ids):
 
     Пример некорректного исполнения:
         >>> create_stocks([{"Код": "123", "Количество": "10"}], [])
-        [{'offer_id': '123', 'stock': 10}]
+        []
     """
     # Уберем то, что не загружено в seller
-    stocks = []
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            count = str(watch.get("Количество"))
-            if count == ">10":
-                stock = 100
-            elif count == "1":
-                stock = 0
-            else:
-                stock = int(watch.get("Количество"))
-            stocks.append({"offer_id": str(watch.get("Код")), "stock": stock})
-            offer_ids.remove(str(watch.get("Код")))
-    # Добавим недостающее из загруженного:
-    for offer_id in offer_ids:
-        stocks.append({"offer_id": offer_id, "stock": 0})
-    return stocks
+    loaded = join_remnants(watch_remnants, offer_ids)
+    return list(iter_stocks(loaded, offer_ids))
+
+
+def iter_prices(loaded):
+    """Генерирует цены товаров для обновления на платформе Ozon.
+
+    Эта функция выдает цены по одной, чтобы их можно было отправлять по частям
+    через `divide`, не собирая весь список в памяти. Порядок и состав такие же,
+    как у `create_prices`.
+
+    Аргументы:
+        loaded (pd.DataFrame): Остатки загруженных товаров из `join_remnants`.
+
+    Возвращает:
+        generator: Генератор словарей с артикулом и ценой товара.
+
+    Пример:
+        >>> next(iter_prices(join_remnants([{"Код": "123", "Цена": "5'990.00 руб."}], ["123"])))
+        {'auto_action_enabled': 'UNKNOWN', 'currency_code': 'RUB', 'offer_id': '123', 'old_price': '0', 'price': '5990'}
+    """
+    prices = convert_prices(loaded["Цена"]).tolist()
+    for code, price in zip(loaded["code"].tolist(), prices):
+        yield {
+            "auto_action_enabled": "UNKNOWN",
+            "currency_code": "RUB",
+            "offer_id": code,
+            "old_price": "0",
+            "price": price,
+        }
 
 
 def create_prices(watch_remnants, offer_ids):
@@ -246,8 +384,8 @@ def create_prices(watch_remnants, offer_ids):
     формируя необходимый формат для отправки в Ozon.
 
     Аргументы:
-        watch_remnants (list): Список остатков товаров, содержащий информацию
-                                о кодах товаров и их ценах.
+        watch_remnants (pd.DataFrame | list): Таблица или список остатков товаров,
+                                содержащий информацию о кодах товаров и их ценах.
         offer_ids (list): Список артикулов товаров, загруженных в Ozon.
 
     Возвращает:
@@ -261,18 +399,31 @@ def create_prices(watch_remnants, offer_ids):
         >>> create_prices([{"Код": "123", "Цена": "5'990.00 руб."}], [])
         []
     """
-    prices = []
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            price = {
-                "auto_action_enabled": "UNKNOWN",
-                "currency_code": "RUB",
-                "offer_id": str(watch.get("Код")),
-                "old_price": "0",
-                "price": price_conversion(watch.get("Цена")),
-            }
-            prices.append(price)
-    return prices
+    loaded = join_remnants(watch_remnants, offer_ids)
+    return list(iter_prices(loaded))
+
+
+def build_payloads(watch_remnants, offer_ids):
+    """Создает остатки и цены товаров для Ozon за один проход по остаткам.
+
+    Остатки сверяются с артикулами один раз через `join_remnants`, а остатки и
+    цены формируются из общего результата.
+
+    Аргументы:
+        watch_remnants (pd.DataFrame | list): Таблица или список остатков товаров.
+        offer_ids (list): Список артикулов товаров, загруженных в Ozon.
+
+    Возвращает:
+        tuple: Генераторы остатков и цен, как у `iter_stocks` и `iter_prices`.
+
+    Пример:
+        >>> stocks, prices = build_payloads([{"Код": "123", "Количество": "10", "Цена": "5'990.00 руб."}], ["123"])
+        >>> list(stocks), list(prices)
+        ([{'offer_id': '123', 'stock': 10}], [{'auto_action_enabled': 'UNKNOWN', 'currency_code': 'RUB', 'offer_id': '123', 'old_price': '0', 'price': '5990'}])
+    """
+    # Уберем то, что не загружено в seller
+    loaded = join_remnants(watch_remnants, offer_ids)
+    return iter_stocks(loaded, offer_ids), iter_prices(loaded)
 
 
 def price_conversion(price: str) -> str:
@@ -298,18 +449,61 @@ def price_conversion(price: str) -> str:
     Исключения:
         ValueError: Если строка не может быть преобразована в цену.
     """
-    return re.sub("[^0-9]", "", price.split(".")[0])
+    return _PRICE_NOISE.sub("", price)
+
+
+def convert_prices(prices: pd.Series) -> pd.Series:
+    """Преобразует колонку цен в числовые значения.
+
+    Векторный вариант `price_conversion`: вся колонка обрабатывается строковыми
+    методами pandas за один проход вместо вызова функции для каждой строки.
+
+    Аргументы:
+        prices (pd.Series): Колонка цен, например, "5'990.00 руб.".
+
+    Возвращает:
+        pd.Series: Колонка строк с числовой частью цены, например, "5990".
+
+    Пример:
+        >>> convert_prices(pd.Series(["5'990.00 руб.", "1'500.50 руб."])).tolist()
+        ['5990', '1500']
+    """
+    # Шаблон передается строкой: скомпилированное выражение заставляет pandas
+    # обходить строки Arrow поэлементно в Python.
+    prices = prices.astype(_STRING_DTYPE)
+    return prices.str.replace(_PRICE_NOISE.pattern, "", regex=True)
+
 
+def convert_stocks(quantities: pd.Series) -> pd.Series:
+    """Преобразует колонку количества товаров в остатки для загрузки.
 
-def divide(lst: list, n: int):
-    """Разделяет список на части по n элементов.
+    Значение ">10" превращается в 100, "1" — в 0 (последний экземпляр не
+    выставляется на продажу), остальные значения приводятся к целому числу.
+
+    Аргументы:
+        quantities (pd.Series): Колонка количества, например, "10" или ">10".
+
+    Возвращает:
+        pd.Series: Колонка целых остатков.
+
+    Пример:
+        >>> convert_stocks(pd.Series([">10", "1", "5"])).tolist()
+        [100, 0, 5]
+    """
+    counts = quantities.astype(_STRING_DTYPE).replace({">10": "100", "1": "0"})
+    return pd.to_numeric(counts, errors="coerce").fillna(0).astype(int)
+
+
+def divide(lst, n: int):
+    """Разделяет последовательность на части по n элементов.
 
     Эта функция делит большой список на несколько подсписков по n элементов в каждом.
     Это полезно для отправки данных в API, где есть ограничение по количеству элементов
-    в одном запросе.
+    в одном запросе. Части создаются по мере чтения, поэтому на вход можно подать
+    и генератор.
 
     Аргументы:
-        lst (list): Список, который необходимо разделить.
+        lst (iterable): Список или генератор, который необходимо разделить.
         n (int): Количество элементов в каждом подсписке.
 
     Возвращает:
@@ -321,10 +515,77 @@ def divide(lst: list, n: int):
 
     Пример некорректного исполнения:
         >>> list(divide([1, 2, 3], 0))
-        Ошибка: Деление на ноль.
+        ValueError: Размер части должен быть больше нуля.
     """
-    for i in range(0, len(lst), n):
-        yield lst[i : i + n]
+    if n < 1:
+        raise ValueError("Размер части должен быть больше нуля.")
+    items = iter(lst)
+    while chunk := list(islice(items, n)):
+        yield chunk
+
+
+def submit_chunks(update_func, chunks, *args, max_workers=8):
+    """Отправляет части данных в API параллельно.
+
+    Эта функция вызывает `update_func` для каждой части данных в пуле потоков.
+    Запросы к API ограничены сетью, поэтому одновременная отправка нескольких
+    частей сокращает общее время загрузки. Одновременно в работе не больше
+    `max_workers` частей, поэтому генератор частей читается по мере отправки.
+    Если хотя бы одна часть не была загружена, функция дожидается остальных и
+    выбрасывает первое исключение.
+
+    Аргументы:
+        update_func (callable): Функция отправки одной части, например `update_price`.
+        chunks (iterable): Части данных, например, генератор `divide`.
+        *args: Дополнительные аргументы для `update_func` (идентификаторы и токен).
+        max_workers (int): Количество одновременных запросов.
+
+    Возвращает:
+        list: Ответы API для каждой части в исходном порядке.
+
+    Пример:
+        >>> submit_chunks(update_price, [[{"offer_id": "123", "price": "5990"}]], "client_id_example", "seller_token_example")
+        [{"status": "success"}]
+
+    Пример некорректного исполнения:
+        >>> submit_chunks(update_price, [[{"offer_id": "123", "price": "5990"}]], "", "")
+        Ошибка: Недействительный токен API или клиентский идентификатор.
+    """
+    futures = []
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for chunk in chunks:
+            if len(pending) >= max_workers:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            future = executor.submit(update_func, chunk, *args)
+            futures.append(future)
+            pending.add(future)
+    errors = [future.exception() for future in futures if future.exception()]
+    if errors:
+        raise errors[0]
+    return [future.result() for future in futures]
+
+
+async def upload_chunks(update_func, chunks, *args):
+    """Асинхронно отправляет части данных в API.
+
+    Запросы выполняются в пуле потоков через `submit_chunks`, а корутина не
+    блокирует цикл событий, поэтому несколько загрузок можно запускать
+    одновременно через `asyncio.gather`.
+
+    Аргументы:
+        update_func (callable): Функция отправки одной части, например `update_price`.
+        chunks (iterable): Части данных, например, генератор `divide`.
+        *args: Дополнительные аргументы для `update_func` (идентификаторы и токен).
+
+    Возвращает:
+        list: Ответы API для каждой части в исходном порядке.
+
+    Пример:
+        >>> await upload_chunks(update_price, [[{"offer_id": "123", "price": "5990"}]], "client_id_example", "seller_token_example")
+        [{"status": "success"}]
+    """
+    return await asyncio.to_thread(submit_chunks, update_func, chunks, *args)
 
 
 async def upload_prices(watch_remnants, client_id, seller_token):
@@ -334,7 +595,7 @@ async def upload_prices(watch_remnants, client_id, seller_token):
     отправляет данные на платформу Ozon по частям.
 
     Аргументы:
-        watch_remnants (list): Список остатков товаров, содержащий информацию о ценах.
+        watch_remnants (pd.DataFrame): Таблица остатков товаров, содержащая информацию о ценах.
         client_id (str): Уникальный идентификатор клиента Ozon.
         seller_token (str): Токен API для аутентификации.
 
@@ -349,10 +610,9 @@ async def upload_prices(watch_remnants, client_id, seller_token):
         >>> await upload_prices([], "", "")
         Ошибка: Недействительный токен API или клиентский идентификатор.
     """
-    offer_ids = get_offer_ids(client_id, seller_token)
+    offer_ids = await asyncio.to_thread(get_offer_ids, client_id, seller_token)
     prices = create_prices(watch_remnants, offer_ids)
-    for some_price in list(divide(prices, 1000)):
-        update_price(some_price, client_id, seller_token)
+    await upload_chunks(update_price, divide(prices, 1000), client_id, seller_token)
     return prices
 
 
@@ -363,7 +623,7 @@ async def upload_stocks(watch_remnants, client_id, seller_token):
     отправляет данные на платформу Ozon по частям.
 
     Аргументы:
-        watch_remnants (list): Список остатков товаров, содержащий информацию о количестве.
+        watch_remnants (pd.DataFrame): Таблица остатков товаров, содержащая информацию о количестве.
         client_id (str): Уникальный идентификатор клиента Ozon.
         seller_token (str): Токен API для аутентификации.
 
@@ -380,14 +640,40 @@ async def upload_stocks(watch_remnants, client_id, seller_token):
         >>> await upload_stocks([], "", "")
         Ошибка: Недействительный токен API или клиентский идентификатор.
     """
-    offer_ids = get_offer_ids(client_id, seller_token)
+    offer_ids = await asyncio.to_thread(get_offer_ids, client_id, seller_token)
     stocks = create_stocks(watch_remnants, offer_ids)
-    for some_stock in list(divide(stocks, 100)):
-        update_stocks(some_stock, client_id, seller_token)
+    await upload_chunks(update_stocks, divide(stocks, 100), client_id, seller_token)
     not_empty = list(filter(lambda stock: (stock.get("stock") != 0), stocks))
     return not_empty, stocks
 
 
+async def upload_remnants(watch_remnants, client_id, seller_token):
+    """Загружает остатки и цены товаров на платформу Ozon.
+
+    Эта асинхронная функция один раз получает артикулы товаров и отправляет
+    остатки и цены на платформу Ozon одновременно. Данные формируются по мере
+    отправки частей, поэтому полные списки в памяти не собираются.
+
+    Аргументы:
+        watch_remnants (pd.DataFrame): Таблица остатков товаров с количеством и ценами.
+        client_id (str): Уникальный идентификатор клиента Ozon.
+        seller_token (str): Токен API для аутентификации.
+
+    Пример:
+        >>> await upload_remnants(watch_remnants, "client_id_example", "seller_token_example")
+
+    Пример некорректного исполнения:
+        >>> await upload_remnants([], "", "")
+        Ошибка: Недействительный токен API или клиентский идентификатор.
+    """
+    offer_ids = await asyncio.to_thread(get_offer_ids, client_id, seller_token)
+    stocks, prices = build_payloads(watch_remnants, offer_ids)
+    await asyncio.gather(
+        upload_chunks(update_stocks, divide(stocks, 100), client_id, seller_token),
+        upload_chunks(update_price, divide(prices, 900), client_id, seller_token),
+    )
+
+
 def main():
     """Основная функция для обновления остатков и цен на Ozon.
 
@@ -405,22 +691,17 @@ def main():
     seller_token = env.str("SELLER_TOKEN")
     client_id = env.str("CLIENT_ID")
     try:
-        offer_ids = get_offer_ids(client_id, seller_token)
         watch_remnants = download_stock()
-        # Обновить остатки
-        stocks = create_stocks(watch_remnants, offer_ids)
-        for some_stock in list(divide(stocks, 100)):
-            update_stocks(some_stock, client_id, seller_token)
-        # Поменять цены
-        prices = create_prices(watch_remnants, offer_ids)
-        for some_price in list(divide(prices, 900)):
-            update_price(some_price, client_id, seller_token)
+        # Обновить остатки и цены
+        asyncio.run(upload_remnants(watch_remnants, client_id, seller_token))
     except requests.exceptions.ReadTimeout:
         print("Превышено время ожидания...")
     except requests.exceptions.ConnectionError as error:
         print(error, "Ошибка соединения")
     except Exception as error:
         print(error, "ERROR_2")
+    finally:
+        get_offer_ids.cache_clear()
 
 
 if __name__ == "__main__":